@@ -7,22 +7,78 @@ Phase 1: NO AI - Pure data loading and parsing
 
 import json
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Iterable, Iterator, List, Dict, Optional, Union
+from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator; fall back to the json module
+    orjson = None
 
-@dataclass
+try:
+    import ciso8601
+except ImportError:  # Optional accelerator; fall back to fromisoformat
+    ciso8601 = None
+
+
+# File extension (without the dot) to language
+_EXT_TO_LANG = {
+    'py': 'python',
+    'go': 'go',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'tsx': 'typescript',
+    'jsx': 'javascript',
+    'java': 'java',
+    'rb': 'ruby',
+    'rs': 'rust',
+    'c': 'c',
+    'cpp': 'cpp',
+    'cc': 'cpp',
+    'h': 'c',
+    'hpp': 'cpp',
+    'cs': 'csharp',
+    'sh': 'shell',
+    'yaml': 'yaml',
+    'yml': 'yaml',
+    'json': 'json',
+    'xml': 'xml',
+    'md': 'markdown',
+}
+
+
+@lru_cache(maxsize=8192)
+def _detect_language(filepath: str) -> Optional[str]:
+    """Detect language from file extension; paths repeat across comments."""
+    # splitext only looks at the last path component and ignores a leading
+    # dot, so dotfiles such as 'docs/.md' get no language
+    ext = os.path.splitext(filepath)[1]
+    return _EXT_TO_LANG.get(ext[1:].lower())
+
+
+@dataclass(slots=True)
 class User:
     """GitHub user info."""
     login: str
     id: int
     type: str  # User, Bot
     avatar_url: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'login': self.login,
+            'id': self.id,
+            'type': self.type,
+            'avatar_url': self.avatar_url,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewComment:
     """Inline code review comment with code context."""
     # GitHub IDs
@@ -55,16 +111,30 @@ class ReviewComment:
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        d = asdict(self)
-        # Convert datetime to ISO string
-        d['created_at'] = self.created_at.isoformat()
-        d['updated_at'] = self.updated_at.isoformat()
-        # Convert nested User to dict
-        d['reviewer'] = asdict(self.reviewer)
-        return d
+        # Built by hand: asdict() deep-copies every field recursively
+        return {
+            'comment_id': self.comment_id,
+            'pr_number': self.pr_number,
+            'repo': self.repo,
+            'body': self.body,
+            'reviewer': self.reviewer.to_dict(),
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'path': self.path,
+            'line': self.line,
+            'original_line': self.original_line,
+            'diff_hunk': self.diff_hunk,
+            'commit_id': self.commit_id,
+            'original_commit_id': self.original_commit_id,
+            'side': self.side,
+            'start_side': self.start_side,
+            'position': self.position,
+            'original_position': self.original_position,
+            'language': self.language,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class FileChange:
     """File change information."""
     filename: str
@@ -73,9 +143,20 @@ class FileChange:
     deletions: int
     changes: int
     patch: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'filename': self.filename,
+            'status': self.status,
+            'additions': self.additions,
+            'deletions': self.deletions,
+            'changes': self.changes,
+            'patch': self.patch,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class PullRequest:
     """Pull request with review comments."""
     # PR metadata
@@ -103,19 +184,29 @@ class PullRequest:
     # Comments
     comments: List[ReviewComment]
     
+    def iter_comments(self) -> Iterator[ReviewComment]:
+        """Iterate over inline review comments."""
+        yield from self.comments
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        d = asdict(self)
-        # Convert datetimes
-        d['created_at'] = self.created_at.isoformat()
-        d['updated_at'] = self.updated_at.isoformat()
-        d['closed_at'] = self.closed_at.isoformat() if self.closed_at else None
-        d['merged_at'] = self.merged_at.isoformat() if self.merged_at else None
-        # Convert nested objects
-        d['author'] = asdict(self.author)
-        d['comments'] = [c.to_dict() for c in self.comments]
-        d['files'] = [asdict(f) for f in self.files]
-        return d
+        return {
+            'repo': self.repo,
+            'number': self.number,
+            'title': self.title,
+            'state': self.state,
+            'merged': self.merged,
+            'author': self.author.to_dict(),
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'closed_at': self.closed_at.isoformat() if self.closed_at else None,
+            'merged_at': self.merged_at.isoformat() if self.merged_at else None,
+            'additions': self.additions,
+            'deletions': self.deletions,
+            'changed_files': self.changed_files,
+            'files': [f.to_dict() for f in self.files],
+            'comments': [c.to_dict() for c in self.comments],
+        }
 
 
 class PRLoader:
@@ -126,62 +217,49 @@ class PRLoader:
     
     def detect_language(self, filepath: str) -> Optional[str]:
         """Detect programming language from file extension."""
-        ext_to_lang = {
-            '.py': 'python',
-            '.go': 'go',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.jsx': 'javascript',
-            '.java': 'java',
-            '.rb': 'ruby',
-            '.rs': 'rust',
-            '.c': 'c',
-            '.cpp': 'cpp',
-            '.cc': 'cpp',
-            '.h': 'c',
-            '.hpp': 'cpp',
-            '.cs': 'csharp',
-            '.sh': 'shell',
-            '.yaml': 'yaml',
-            '.yml': 'yaml',
-            '.json': 'json',
-            '.xml': 'xml',
-            '.md': 'markdown',
-        }
-        
-        ext = os.path.splitext(filepath)[1].lower()
-        return ext_to_lang.get(ext)
+        return _detect_language(filepath)
     
     def parse_datetime(self, dt_str: str) -> Optional[datetime]:
         """Parse GitHub datetime string."""
         if not dt_str:
             return None
         try:
+            if ciso8601 is not None:
+                return ciso8601.parse_datetime(dt_str)
             return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
         except:
             return None
     
-    def load_pr(self, pr_file: Path) -> Optional[PullRequest]:
-        """Load a single PR from JSON file."""
+    def load_pr(self, pr_file: Union[str, Path], repo: Optional[str] = None) -> Optional[PullRequest]:
+        """Load a single PR from JSON file.
+        
+        repo ("owner/name") is derived from the file path unless given.
+        """
         try:
-            with open(pr_file) as f:
-                data = json.load(f)
+            with open(pr_file, 'rb') as f:
+                raw = f.read()
+            # Both decoders raise ValueError subclasses on malformed JSON
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             github_data = data.get('github_data', {})
             
             # Extract repo from file path
             # Path format: .data/api.github.com/repos/owner/repo/pulls/123.json
-            parts = pr_file.parts
-            owner_idx = parts.index('repos') + 1
-            repo = f"{parts[owner_idx]}/{parts[owner_idx + 1]}"
+            if repo is None:
+                parts = Path(pr_file).parts
+                owner_idx = parts.index('repos') + 1
+                repo = f"{parts[owner_idx]}/{parts[owner_idx + 1]}"
+            
+            # Logins, user types, paths and the repo name recur across
+            # thousands of comments; interning stores each distinct value once
+            repo = sys.intern(repo)
             
             # Parse author
             author_data = github_data.get('user', {})
             author = User(
-                login=author_data.get('login', 'unknown'),
+                login=sys.intern(author_data.get('login', 'unknown')),
                 id=author_data.get('id', 0),
-                type=author_data.get('type', 'User'),
+                type=sys.intern(author_data.get('type', 'User')),
                 avatar_url=author_data.get('avatar_url')
             )
             
@@ -206,13 +284,13 @@ class PRLoader:
                 
                 reviewer_data = c.get('user', {})
                 reviewer = User(
-                    login=reviewer_data.get('login', 'unknown'),
+                    login=sys.intern(reviewer_data.get('login', 'unknown')),
                     id=reviewer_data.get('id', 0),
-                    type=reviewer_data.get('type', 'User'),
+                    type=sys.intern(reviewer_data.get('type', 'User')),
                     avatar_url=reviewer_data.get('avatar_url')
                 )
                 
-                path = c.get('path', '')
+                path = sys.intern(c.get('path', ''))
                 comment = ReviewComment(
                     comment_id=c.get('id', 0),
                     pr_number=github_data.get('number', 0),
@@ -268,15 +346,21 @@ class PRLoader:
             return []
         
         prs = []
-        pr_files = sorted(repo_path.glob("*.json"))
-        
-        # Filter out supplementary files (_reviews, _comments, etc.)
-        pr_files = [f for f in pr_files if '_' not in f.stem]
+        # Filter out supplementary files (_reviews, _comments, etc.);
+        # scandir avoids the per-entry Path wrapping done by glob()
+        with os.scandir(repo_path) as entries:
+            pr_files = sorted(
+                e.path for e in entries
+                if e.name.endswith('.json') and '_' not in e.name[:-5] and e.is_file()
+            )
         
         print(f"Loading {len(pr_files)} PRs from {owner}/{repo}...")
         
+        # owner/repo is already known here, so skip parsing it per file
+        repo_name = f"{owner}/{repo}"
+        
         for pr_file in pr_files:
-            pr = self.load_pr(pr_file)
+            pr = self.load_pr(pr_file, repo=repo_name)
             if pr:
                 prs.append(pr)
         
@@ -284,12 +368,17 @@ class PRLoader:
         
         return prs
     
+    def iter_all_comments(self, prs: Iterable[PullRequest]) -> Iterator[ReviewComment]:
+        """Iterate over all inline review comments from PRs.
+        
+        Unlike extract_all_comments(), no combined list is built.
+        """
+        for pr in prs:
+            yield from pr.iter_comments()
+    
     def extract_all_comments(self, prs: List[PullRequest]) -> List[ReviewComment]:
         """Extract all inline review comments from PRs."""
-        comments = []
-        for pr in prs:
-            comments.extend(pr.comments)
-        return comments
+        return list(self.iter_all_comments(prs))
 
 
 if __name__ == "__main__":